@@ -139,8 +139,11 @@ class MinRenovasjon:
                     return None
 
     async def _get_from_web_api(self):
-        tommekalender = await self._get_tommekalender_from_web_api()
-        fraksjoner = await self._get_fraksjoner_from_web_api()
+        # The two requests are independent, so run them concurrently
+        tommekalender, fraksjoner = await asyncio.gather(
+            self._get_tommekalender_from_web_api(),
+            self._get_fraksjoner_from_web_api(),
+        )
         return tommekalender, fraksjoner
 
     @staticmethod
@@ -1,14 +1,46 @@
 """Calendar platform for min_renovasjon."""
+import aiohttp
+import asyncio
+import functools
+import heapq
 import logging
+from bisect import bisect_left, bisect_right
 from datetime import datetime, timedelta
 from homeassistant.components.calendar import CalendarEntity, CalendarEvent
 from homeassistant.core import callback
-from homeassistant.util.dt import as_utc, start_of_local_day  # Import start_of_local_day
+from homeassistant.util.dt import as_utc, now as dt_now, start_of_local_day, utcnow
 
 from .const import DOMAIN, CALENDAR_NAME
 
 _LOGGER = logging.getLogger(__name__)
 
+# How long fetched events are reused before asking Min Renovasjon again
+EVENTS_CACHE_TTL = timedelta(minutes=15)
+
+# Longest a pickup event can last, a local day is 25 hours when DST ends
+MAX_EVENT_DURATION = timedelta(hours=25)
+
+
+@functools.lru_cache(maxsize=64)
+def _summary_strings(fraction_name):
+    """Return the shared summary and description for a fraction's events."""
+    return f"{fraction_name} tømming", f"Tømming av {fraction_name}"
+
+
+def _make_event(summary, description, pickup_date):
+    """Create an all-day pickup event."""
+    # Convert to timezone-aware datetime using Home Assistant's helper
+    event_start = as_utc(start_of_local_day(pickup_date))
+    event_end = as_utc(start_of_local_day(pickup_date + timedelta(days=1)))
+
+    return CalendarEvent(
+        summary=summary,
+        start=event_start,
+        end=event_end,
+        description=description,
+    )
+
+
 class MinRenovasjonCalendarEntity(CalendarEntity):
     """Representation of a Min Renovasjon Calendar Entity."""
 
@@ -16,24 +48,21 @@ class MinRenovasjonCalendarEntity(CalendarEntity):
         """Initialize the calendar entity."""
         self._hass = hass
         self._min_renovasjon = min_renovasjon
-        self._name = CALENDAR_NAME
-        self._events = []
+        self._attr_name = CALENDAR_NAME
+        self._attr_unique_id = f"{config_entry.entry_id}_calendar"
+        self._events = ()
+        self._event_starts = ()
+        self._next_event_index = 0
+        self._events_version = 0
+        self._next_event_cache = None
+        self._events_fetched_at = None
+        self._cache_ttl = EVENTS_CACHE_TTL
         self.config_entry = config_entry
         
-    @property
-    def name(self):
-        """Return the name of the calendar entity."""
-        return self._name
-
     @property
     def event(self):
         """Return the next upcoming event."""
         return self._get_next_event()
-    
-    @property
-    def unique_id(self):
-        """Return a unique ID to use for this entity."""
-        return f"{self.config_entry.entry_id}_calendar"
 
     async def async_get_events(
         self,
@@ -42,107 +71,150 @@ class MinRenovasjonCalendarEntity(CalendarEntity):
         end_date: datetime,
     ) -> list[CalendarEvent]:
         """Return calendar events within a datetime range."""
-        try:
-            # Ensure start_date and end_date are UTC
-            start_date = as_utc(start_date)
-            end_date = as_utc(end_date)
-            
-            # Fetch updated calendar data
-            self._events = await self._fetch_events()
-            
-            # Filter events to include only those within the requested date range
-            return [
-                event for event in self._events
-                if (start_date <= as_utc(event.start) <= end_date or
-                    start_date <= as_utc(event.end) <= end_date or
-                    (as_utc(event.start) <= start_date and end_date <= as_utc(event.end)))
-            ]
-        except Exception as e:
-            _LOGGER.error(f"Error getting events: {e}")
-            return []
+        # Ensure start_date and end_date are UTC
+        start_date = as_utc(start_date)
+        end_date = as_utc(end_date)
+        
+        # Only refetch calendar data when the cached events are stale
+        if self._events_stale():
+            await self._refresh_events()
+        
+        # Events are sorted by start, so skip straight to the first one that
+        # can still overlap the range and stop once we pass its end
+        index = bisect_left(self._event_starts, start_date - MAX_EVENT_DURATION)
+        result = []
+        for event in self._events[index:]:
+            if event.start > end_date:
+                break
+            if event.end >= start_date:
+                result.append(event)
+        return result
     
     async def async_update(self):
         """Update the calendar with new events from the API."""
         try:
-            self._events = await self._fetch_events()
+            await self._refresh_events()
         except Exception as e:
+            # Keep the cached events, a failed refresh should not empty the calendar
             _LOGGER.error(f"Error updating calendar: {e}")
-            self._events = []
+
+    def _events_stale(self):
+        """Return True if the cached events should be fetched again."""
+        if self._events_fetched_at is None:
+            return True
+        return utcnow() - self._events_fetched_at > self._cache_ttl
+
+    async def _refresh_events(self):
+        """Fetch events and remember when they were fetched."""
+        events = await self._fetch_events()
+        if events is None:
+            return
+
+        self._set_events(events)
+        self._events_fetched_at = utcnow()
+
+    def _set_events(self, events):
+        """Store sorted events along with the lookup data derived from them.
+
+        The events are kept as a tuple and never modified until replaced here.
+        """
+        # Unchanged events keep their version, so the next event stays memoized
+        if events == self._events:
+            return
+
+        self._events = events
+        self._event_starts = tuple(event.start for event in events)
+        self._next_event_index = 0
+        self._events_version += 1
 
     async def _fetch_events(self):
-        """Fetch calendar events from Min Renovasjon data."""
-        events = []
-        
+        """Fetch calendar events from Min Renovasjon data.
+
+        Returns None if no new data could be fetched, so the cached events
+        are kept.
+        """
         try:
             # Get the calendar list from min_renovasjon
             calendar_list = await self._min_renovasjon.get_calendar_list()
+        except (aiohttp.ClientError, asyncio.TimeoutError, ValueError, KeyError) as e:
+            _LOGGER.error(f"Error fetching events: {e}")
+            return None
+
+        # get_calendar_list returns None when the upstream request failed
+        if calendar_list is None:
+            _LOGGER.debug("No calendar data received, keeping cached events")
+            return None
+
+        # Building the events is pure Python work, keep it off the event loop
+        events = await self._hass.async_add_executor_job(
+            self._build_events, calendar_list
+        )
+        _LOGGER.debug(f"Generated {len(events)} calendar events")
+        return events
+
+    @staticmethod
+    def _build_events(calendar_list):
+        """Build a sorted tuple of events from a Min Renovasjon calendar list.
+
+        Event start and end are always timezone-aware UTC datetimes, so callers
+        can compare them directly without converting each event again.
+        """
+        per_fraction = []
+        seen = set()
+        # Pickup dates are local calendar dates, compare them with today's date
+        # in Home Assistant's time zone rather than the host's
+        today = dt_now().date()
+
+        for entry in calendar_list:
+            if entry is None:
+                continue
             
-            if calendar_list:
-                for entry in calendar_list:
-                    if entry is None:
+            try:
+                fraction_id, fraction_name, _, pickup_date, next_pickup_date = entry
+                summary, description = _summary_strings(fraction_name)
+                fraction_events = []
+                per_fraction.append(fraction_events)
+                
+                # Create events for the upcoming pickup and the one after that
+                for pickup in (pickup_date, next_pickup_date):
+                    if not pickup or pickup.date() < today:
                         continue
-                    
-                    try:
-                        fraction_id, fraction_name, _, pickup_date, next_pickup_date = entry
-                        
-                        # Create an event for the upcoming pickup
-                        if pickup_date and pickup_date.date() >= datetime.now().date():
-                            # Convert to timezone-aware datetime using Home Assistant's helper
-                            event_start = as_utc(start_of_local_day(pickup_date))
-                            event_end = as_utc(start_of_local_day(pickup_date + timedelta(days=1)))
-                            
-                            events.append(
-                                CalendarEvent(
-                                    summary=f"{fraction_name} tømming",
-                                    start=event_start,
-                                    end=event_end,
-                                    description=f"Tømming av {fraction_name}",
-                                )
-                            )
-                        
-                        # Create an event for the next pickup after that
-                        if next_pickup_date and next_pickup_date.date() >= datetime.now().date():
-                            # Convert to timezone-aware datetime
-                            event_start = as_utc(start_of_local_day(next_pickup_date))
-                            event_end = as_utc(start_of_local_day(next_pickup_date + timedelta(days=1)))
-                            
-                            events.append(
-                                CalendarEvent(
-                                    summary=f"{fraction_name} tømming",
-                                    start=event_start,
-                                    end=event_end,
-                                    description=f"Tømming av {fraction_name}",
-                                )
-                            )
-                    except (ValueError, TypeError, IndexError) as e:
-                        _LOGGER.error(f"Error processing calendar entry {entry}: {e}")
+
+                    key = (fraction_id, pickup.date())
+                    if key in seen:
                         continue
-            
-            # Sort events by start date
-            events.sort(key=lambda x: x.start)
-            _LOGGER.debug(f"Generated {len(events)} calendar events")
-            return events
-            
-        except Exception as e:
-            _LOGGER.error(f"Error fetching events: {e}")
-            return []
+                    seen.add(key)
+                    fraction_events.append(_make_event(summary, description, pickup))
+
+                # The next pickup should never come first, but merge relies on it
+                fraction_events.sort(key=lambda x: x.start)
+            except (ValueError, TypeError, IndexError) as e:
+                _LOGGER.error(f"Error processing calendar entry {entry}: {e}")
+                continue
+
+        # Each fraction's events are already in order, so merge rather than sort
+        return tuple(heapq.merge(*per_fraction, key=lambda x: x.start))
 
     def _get_next_event(self):
         """Return the next upcoming event."""
-        now = as_utc(datetime.now())  # Make sure we're comparing with timezone-aware datetimes
-        try:
-            future_events = [
-                event for event in self._events
-                if event.start >= now
-            ]
-            
-            if not future_events:
-                return None
-                
-            return min(future_events, key=lambda x: x.start)
-        except Exception as e:
-            _LOGGER.error(f"Error getting next event: {e}")
-            return None
+        minute = utcnow().replace(second=0, microsecond=0)
+
+        # Events start on whole minutes, so the answer can only change when the
+        # events are replaced or the minute rolls over
+        key = (self._events_version, minute)
+        if self._next_event_cache is not None and self._next_event_cache[0] == key:
+            return self._next_event_cache[1]
+
+        # Time only moves forward, so the cached index is a lower bound and
+        # usually still points at the next event
+        index = self._next_event_index
+        if index < len(self._events) and self._event_starts[index] <= minute:
+            index = bisect_right(self._event_starts, minute, index)
+            self._next_event_index = index
+
+        next_event = self._events[index] if index < len(self._events) else None
+        self._next_event_cache = (key, next_event)
+        return next_event
 
 
 async def async_setup_entry(hass, config_entry, async_add_entities):